@@ -1,6 +1,7 @@
 import streamlit as st
 import pandas as pd
 import model_utils
+import feedback_metrics
 from datetime import datetime
 
 st.set_page_config(page_title="VibeSnack", page_icon="🍿", layout="wide")
@@ -12,6 +13,20 @@ def get_model():
 
 model = get_model()
 
+# Reload snack_catalog.json in the background when it changes on disk
+@st.cache_resource
+def start_catalog_watcher():
+    model_utils.CATALOG.start_watcher()
+
+start_catalog_watcher()
+
+# Shared across sessions so the metrics reflect all live traffic
+@st.cache_resource
+def get_feedback_metrics():
+    return feedback_metrics.FeedbackMetrics()
+
+metrics = get_feedback_metrics()
+
 # Sidebar
 st.sidebar.title("🍿 VibeSnack")
 st.sidebar.markdown("Your tiny, delightful snack recommender.")
@@ -20,10 +35,14 @@ if st.sidebar.button("Retrain Model"):
     with st.spinner("Training..."):
         import train_model
         train_model.train()
-        st.cache_resource.clear()
+        # Only drop the model; clearing every cached resource would also wipe live metrics
+        get_model.clear()
         model = get_model()
     st.sidebar.success("Model retrained!")
 
+# Filled in at the end of the script, after this run's feedback is recorded
+live_quality = st.sidebar.empty()
+
 # Main UI
 st.title("What's the vibe? 🤔")
 
@@ -63,6 +82,8 @@ with col1:
             st.session_state['predictions'] = predictions
             st.session_state['user_input'] = user_input
             st.session_state['current_index'] = 0
+            st.session_state['impressions_logged'] = set()
+            st.session_state['feedback_logged'] = set()
         else:
             st.error("Model not loaded. Please train the model first.")
 
@@ -73,12 +94,22 @@ with col2:
         
         if idx < len(preds):
             snack = preds[idx]
+            rank = idx + 1
+            
+            # Streamlit reruns the script on every click, so only log each impression once
+            logged = st.session_state.setdefault('impressions_logged', set())
+            if idx not in logged:
+                metrics.record_impression(st.session_state['user_input'], snack['id'], rank)
+                logged.add(idx)
+            # At most one accept or reject per impression, or rates can exceed 100%
+            feedback_logged = st.session_state.setdefault('feedback_logged', set())
             
             st.subheader("I recommend...")
             st.markdown(f"## **{snack['name']}**")
             
             # Tags
             st.write(f"Tags: {', '.join(snack['tags'])}")
+            st.caption(f"Catalog v{snack['catalog_version']}")
             
             # Message
             msg = model_utils.format_personalized_message(st.session_state['user_input'], snack['name'])
@@ -89,11 +120,17 @@ with col2:
             with c1:
                 if st.button("Accept ✅", key=f"accept_{idx}"):
                     model_utils.update_user_history(snack['id'])
+                    if idx not in feedback_logged:
+                        metrics.record_accept(st.session_state['user_input'], snack['id'], rank)
+                        feedback_logged.add(idx)
                     st.toast("Saved to your history — used to personalize later!")
                     st.balloons()
             
             with c2:
                 if st.button("Try another 🔄", key=f"next_{idx}"):
+                    if idx not in feedback_logged:
+                        metrics.record_reject(st.session_state['user_input'], snack['id'], rank)
+                        feedback_logged.add(idx)
                     if idx + 1 < len(preds):
                         st.session_state['current_index'] = idx + 1
                         st.rerun()
@@ -116,3 +153,19 @@ with col2:
         else:
             st.write("No more recommendations. Try changing your inputs!")
 
+with live_quality.container(), st.expander("Live quality"):
+    snapshot = metrics.snapshot()
+    for window_name, window in snapshot.items():
+        overall = window['slices'].get(("all", "all"))
+        if not overall or overall['accept_rate'] is None:
+            st.write(f"**{window_name}:** no feedback yet")
+            continue
+        st.write(
+            f"**{window_name}:** accept rate {overall['accept_rate']:.1%} "
+            f"over {overall['impressions']} impressions"
+        )
+        if overall['rank_1_share'] is not None:
+            st.caption(
+                f"Accepted at rank 1: {overall['rank_1_share']:.0%}, "
+                f"rank 2-5: {overall['rank_2_5_share']:.0%}"
+            )
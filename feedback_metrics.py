@@ -0,0 +1,174 @@
+import threading
+import time
+from collections import Counter
+
+import model_utils
+
+# Sliding windows we report on: name -> (bucket width in seconds, number of buckets)
+DEFAULT_WINDOWS = {
+    "5m": (10, 30),
+    "1h": (60, 60),
+    "24h": (900, 96),
+}
+
+# Ranks are 1-based; anything past rank 1 up to this counts as "rank 2-5"
+MAX_TRACKED_RANK = 5
+
+
+class SlidingWindowCounter:
+    """
+    Counts keyed events over a sliding time window using a ring of buckets.
+
+    Each bucket covers `bucket_seconds` and the ring holds `num_buckets` of
+    them, so memory is bounded by the number of distinct keys, not events.
+    A running total is kept alongside the ring: expired buckets are
+    subtracted as the window slides, so both add() and snapshot() avoid
+    summing the whole ring.
+    """
+
+    def __init__(self, bucket_seconds, num_buckets):
+        self.bucket_seconds = bucket_seconds
+        self.num_buckets = num_buckets
+        self._buckets = [Counter() for _ in range(num_buckets)]
+        self._stamps = [None] * num_buckets
+        self._totals = Counter()
+        self._head = None  # absolute index of the newest bucket seen
+
+    def _advance(self, now):
+        current = int(now // self.bucket_seconds)
+        if self._head is not None and current <= self._head:
+            return self._head
+        # Expire every bucket that has fallen out of the window; at most a full ring
+        start = current - self.num_buckets + 1
+        if self._head is not None:
+            start = max(start, self._head + 1)
+        for idx in range(start, current + 1):
+            slot = idx % self.num_buckets
+            if self._stamps[slot] is not None:
+                self._totals.subtract(self._buckets[slot])
+                self._buckets[slot].clear()
+            self._stamps[slot] = idx
+        self._head = current
+        return current
+
+    def add(self, keys, now):
+        head = self._advance(now)
+        idx = int(now // self.bucket_seconds)
+        if idx <= head - self.num_buckets:
+            return  # older than the window, nothing to count
+        bucket = self._buckets[idx % self.num_buckets]
+        for key in keys:
+            bucket[key] += 1
+            self._totals[key] += 1
+
+    def snapshot(self, now):
+        self._advance(now)
+        return {k: v for k, v in self._totals.items() if v > 0}
+
+
+def _slices(user_input):
+    return [
+        ("all", "all"),
+        ("mood", user_input.get("mood")),
+        ("context", user_input.get("context")),
+        ("time", model_utils.get_time_category(user_input.get("hour", 0))),
+    ]
+
+
+def _ratio(num, den):
+    return num / den if den else None
+
+
+class FeedbackMetrics:
+    """
+    Streaming online quality metrics for recommendation feedback.
+
+    Record an impression whenever a snack is shown, then an accept or a
+    reject ("Try another") for it. Every event touches a fixed number of
+    counters in each window, so updates are O(1).
+    """
+
+    # Monotonic by default: only relative bucket indices matter, and wall-clock
+    # steps (NTP) would misplace events or expire the whole window
+    def __init__(self, windows=None, clock=time.monotonic):
+        windows = windows or DEFAULT_WINDOWS
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._windows = {
+            name: SlidingWindowCounter(bucket_seconds, num_buckets)
+            for name, (bucket_seconds, num_buckets) in windows.items()
+        }
+
+    def _record(self, event, user_input, snack_id, rank):
+        keys = []
+        for dim, value in _slices(user_input):
+            keys.append((event, dim, value))
+            if event == "accept":
+                position = "rank_1" if rank == 1 else "rank_2_5"
+                if rank <= MAX_TRACKED_RANK:
+                    keys.append((position, dim, value))
+            keys.append(("snack_" + event, int(snack_id), dim, value))
+
+        now = self._clock()
+        with self._lock:
+            for window in self._windows.values():
+                window.add(keys, now)
+
+    def record_impression(self, user_input, snack_id, rank):
+        self._record("impression", user_input, snack_id, rank)
+
+    def record_accept(self, user_input, snack_id, rank):
+        self._record("accept", user_input, snack_id, rank)
+
+    def record_reject(self, user_input, snack_id, rank):
+        self._record("reject", user_input, snack_id, rank)
+
+    def snapshot(self):
+        """
+        Returns {window_name: {"slices": ..., "snacks": ...}} where each slice
+        is keyed by (dimension, value), e.g. ("mood", "sad") or ("all", "all"),
+        and "snacks" maps the same slice keys to {snack_id: stats}.
+        """
+        now = self._clock()
+        with self._lock:
+            raw = {name: window.snapshot(now) for name, window in self._windows.items()}
+
+        result = {}
+        for name, counts in raw.items():
+            slices = {}
+            snacks = {}
+            for key, count in counts.items():
+                if key[0].startswith("snack_"):
+                    event, sid, dim, value = key
+                    per_slice = snacks.setdefault((dim, value), {})
+                    per_slice.setdefault(sid, Counter())[event[len("snack_"):]] = count
+                else:
+                    event, dim, value = key
+                    slices.setdefault((dim, value), Counter())[event] = count
+
+            result[name] = {
+                "slices": {
+                    slice_key: {
+                        "impressions": c["impression"],
+                        "accepts": c["accept"],
+                        "rejects": c["reject"],
+                        "accept_rate": _ratio(c["accept"], c["impression"]),
+                        "rank_1_share": _ratio(c["rank_1"], c["accept"]),
+                        "rank_2_5_share": _ratio(c["rank_2_5"], c["accept"]),
+                    }
+                    for slice_key, c in slices.items()
+                },
+                "snacks": {
+                    slice_key: {
+                        sid: {
+                            "impressions": c["impression"],
+                            "accepts": c["accept"],
+                            "rejects": c["reject"],
+                            "accept_ratio": _ratio(c["accept"], c["impression"]),
+                        }
+                        for sid, c in per_slice.items()
+                    }
+                    for slice_key, per_slice in snacks.items()
+                },
+            }
+        return result
@@ -4,6 +4,11 @@ import numpy as np
 import os
 import json
 import random
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
 from sklearn.base import BaseEstimator, TransformerMixin
 
 def get_time_category(hour):
@@ -23,16 +28,198 @@ class TimeCategoryEncoder(BaseEstimator, TransformerMixin):
         cats = [get_time_category(h) for h in hours]
         return pd.DataFrame(cats, columns=['time_of_day_category'])
 
-# Define Snack Catalog (Duplicate of data_generator for simplicity, or could import)
-def load_snack_catalog():
-    try:
-        with open("snack_catalog.json", "r") as f:
-            return json.load(f)
-    except Exception as e:
-        print(f"Error loading snack catalog: {e}")
-        return []
+# Snack Catalog
+# Held as an immutable snapshot that is swapped atomically when snack_catalog.json
+# changes on disk, so price/availability edits don't need a restart.
+CATALOG_PATH = "snack_catalog.json"
+CATALOG_POLL_SECONDS = 2.0
+
+def diet_allows(diet, tags):
+    # Strict filtering: veg users never see non-veg snacks and vice versa
+    if diet == "veg":
+        return "non-veg" not in tags
+    if diet == "non-veg":
+        return "veg" not in tags
+    return True
+
+def _freeze(value):
+    # Deep-freeze JSON data so a published snapshot can't be mutated in place
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def validate_catalog(raw_snacks):
+    """Raises ValueError if parsed catalog JSON isn't a list of snacks with unique ids."""
+    if not isinstance(raw_snacks, list):
+        raise ValueError("catalog must be a JSON list of snacks")
+    seen = set()
+    for i, s in enumerate(raw_snacks):
+        if not isinstance(s, dict):
+            raise ValueError(f"entry {i} is not an object")
+        if not isinstance(s.get('id'), int) or isinstance(s.get('id'), bool):
+            raise ValueError(f"entry {i} has a missing or non-integer 'id'")
+        if not isinstance(s.get('name'), str):
+            raise ValueError(f"snack {s['id']} has a missing or non-string 'name'")
+        tags = s.get('tags', [])
+        if not isinstance(tags, list) or not all(isinstance(t, str) for t in tags):
+            raise ValueError(f"snack {s['id']} has 'tags' that aren't a list of strings")
+        # A string like "false" would be truthy and leave a pulled snack live
+        if 'available' in s and not isinstance(s['available'], bool):
+            raise ValueError(f"snack {s['id']} has a non-boolean 'available'")
+        if s['id'] in seen:
+            raise ValueError(f"duplicate snack id {s['id']}")
+        seen.add(s['id'])
+
+@dataclass(frozen=True, eq=False)
+class CatalogSnapshot:
+    version: int
+    digest: str
+    snacks: tuple
+    by_id: MappingProxyType
+    tags: MappingProxyType  # snack id -> tuple of tags, in catalog order
+    tag_sets: MappingProxyType  # snack id -> frozenset of tags, for membership checks
+    eligible: MappingProxyType  # diet -> frozenset of available snack ids
+    classes: object  # read-only copy of the classes_ the masks were built for, or None
+    masks: MappingProxyType  # diet -> bool array aligned with classes
+
+    def mask_for(self, classes, diet):
+        """
+        Boolean array aligned with `classes`: True where the snack is in the
+        catalog, available and allowed for `diet`. Precomputed for the
+        classes the snapshot was built with.
+        """
+        key = diet if diet in self.eligible else None
+        if self.classes is not None and np.array_equal(classes, self.classes):
+            return self.masks[key]
+        ids = self.eligible[key]
+        return np.array([cls in ids for cls in classes], dtype=bool)
+
+def build_catalog_snapshot(raw_snacks, version, digest, classes=None):
+    snacks = tuple(_freeze(dict(s)) for s in raw_snacks)
+    by_id = {s['id']: s for s in snacks}
+    tags = {s['id']: s.get('tags', ()) for s in snacks}
+    tag_sets = {sid: frozenset(t) for sid, t in tags.items()}
+    # "available" lets a snack be pulled (e.g. out of stock) without deleting it
+    available = [s['id'] for s in snacks if s.get('available', True)]
+
+    eligible = {
+        diet: frozenset(sid for sid in available if diet_allows(diet, tag_sets[sid]))
+        for diet in ("veg", "non-veg", None)
+    }
+
+    masks = {}
+    if classes is not None:
+        classes = np.array(classes)
+        classes.setflags(write=False)
+        for diet, ids in eligible.items():
+            mask = np.array([cls in ids for cls in classes], dtype=bool)
+            mask.setflags(write=False)
+            masks[diet] = mask
+
+    return CatalogSnapshot(
+        version=version,
+        digest=digest,
+        snacks=snacks,
+        by_id=MappingProxyType(by_id),
+        tags=MappingProxyType(tags),
+        tag_sets=MappingProxyType(tag_sets),
+        eligible=MappingProxyType(eligible),
+        classes=classes,
+        masks=MappingProxyType(masks),
+    )
+
+class CatalogStore:
+    """
+    Owns the current CatalogSnapshot. reload() checks the file's mtime/size
+    and only re-reads it when they change; a new version is published only
+    if the content hash differs. Readers just grab `current()`.
+
+    A catalog that can't be read or validated leaves the previous snapshot
+    in place; the error is kept in `last_error` and printed once per
+    distinct error.
+    """
 
-SNACK_CATALOG = load_snack_catalog()
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._stat = None
+        self._classes = None
+        self._watcher = None
+        self.last_error = None
+
+    def current(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.reload()
+            snapshot = self._snapshot
+        return snapshot
+
+    def reload(self, force=False):
+        """Returns True if a new catalog version was published."""
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+                stat_key = (st.st_mtime_ns, st.st_size)
+                if not force and self._snapshot is not None and stat_key == self._stat:
+                    return False
+                with open(self.path, "rb") as f:
+                    data = f.read()
+                digest = hashlib.sha256(data).hexdigest()
+                if self._snapshot is not None and digest == self._snapshot.digest:
+                    self._stat = stat_key
+                    self.last_error = None
+                    return False
+                raw = json.loads(data)
+                validate_catalog(raw)
+                version = self._snapshot.version + 1 if self._snapshot else 1
+                snapshot = build_catalog_snapshot(raw, version, digest, self._classes)
+            except Exception as e:
+                error = f"Error loading snack catalog: {e}"
+                if error != self.last_error:
+                    print(error)
+                self.last_error = error
+                if self._snapshot is None:
+                    self._snapshot = build_catalog_snapshot([], 0, "", self._classes)
+                return False
+
+            # Only remember the file state once it has been published successfully
+            self._snapshot = snapshot
+            self._stat = stat_key
+            self.last_error = None
+            return True
+
+    def bind_classes(self, classes):
+        """Precomputes diet masks aligned with a (newly loaded) model's classes_."""
+        self.current()
+        with self._lock:
+            self._classes = classes
+            old = self._snapshot
+            self._snapshot = build_catalog_snapshot(old.snacks, old.version, old.digest, classes)
+
+    def start_watcher(self, interval=CATALOG_POLL_SECONDS):
+        if self._watcher is not None:
+            return
+        def poll():
+            while True:
+                time.sleep(interval)
+                # Never let one bad edit stop hot reloading for good
+                try:
+                    self.reload()
+                except Exception as e:
+                    print(f"Catalog watcher error: {e}")
+        self._watcher = threading.Thread(target=poll, name="catalog-watcher", daemon=True)
+        self._watcher.start()
+
+CATALOG = CatalogStore()
+
+def get_catalog():
+    return CATALOG.current()
+
+def load_snack_catalog():
+    return [dict(s) for s in get_catalog().snacks]
 
 MODEL_PATH = "models/snack_model.joblib"
 HISTORY_FILE = "user_history.json"
@@ -40,7 +227,9 @@ HISTORY_FILE = "user_history.json"
 def load_model():
     if os.path.exists(MODEL_PATH):
         try:
-            return joblib.load(MODEL_PATH)
+            model = joblib.load(MODEL_PATH)
+            CATALOG.bind_classes(model.classes_)
+            return model
         except Exception as e:
             print(f"Error loading model: {e}")
             return None
@@ -55,25 +244,23 @@ def prepare_input(user_input):
     """
     return pd.DataFrame([user_input])
 
-def get_snack_by_id(snack_id):
-    for s in SNACK_CATALOG:
-        if s['id'] == snack_id:
-            return s
-    return None
+def get_snack_by_id(snack_id, catalog=None):
+    catalog = catalog or get_catalog()
+    return catalog.by_id.get(snack_id)
 
 def predict_snack(model, user_input, top_k=3):
     """
     Returns top_k snack IDs and their probabilities.
     Also adjusts based on user history.
     """
+    # Pin one snapshot for the whole request so a reload can't mix versions
+    catalog = get_catalog()
     df = prepare_input(user_input)
     
     # Get probabilities
-    probs = model.predict_proba(df)[0]
+    probs = model.predict_proba(df)[0].copy()
     classes = model.classes_
-    
-    # Create a dict of snack_id -> prob
-    prob_dict = {cls: prob for cls, prob in zip(classes, probs)}
+    class_index = {cls: i for i, cls in enumerate(classes)}
     
     # Boost from history
     history = load_user_history()
@@ -81,37 +268,29 @@ def predict_snack(model, user_input, top_k=3):
     if total_history > 0:
         for sid, count in history.items():
             sid = int(sid)
-            if sid in prob_dict:
+            if sid in class_index:
                 # Small boost: 1% per accept, capped at 10%
                 boost = min(0.1, (count / total_history) * 0.2) 
-                prob_dict[sid] += boost
+                probs[class_index[sid]] += boost
     
-    # Sort
-    sorted_snacks = sorted(prob_dict.items(), key=lambda x: x[1], reverse=True)
+    # Filter by diet and availability using the precomputed mask, then sort
+    mask = catalog.mask_for(classes, user_input.get('diet'))
+    scores = np.where(mask, probs, -np.inf)
+    order = np.argsort(-scores, kind="stable")
     
     top_k_snacks = []
-    
-    # Filter by diet
-    user_diet = user_input.get('diet')
-    
-    for sid, prob in sorted_snacks:
-        snack = get_snack_by_id(sid)
-        if snack:
-            # Strict filtering based on user request
-            if user_diet == "veg" and "non-veg" in snack['tags']:
-                continue
-            if user_diet == "non-veg" and "veg" in snack['tags']:
-                continue
-                
-            top_k_snacks.append({
-                "id": sid,
-                "name": snack['name'],
-                "prob": prob,
-                "tags": snack['tags']
-            })
-            
-        if len(top_k_snacks) >= top_k:
+    for i in order[:top_k]:
+        if not mask[i]:
             break
+        sid = classes[i]
+        snack = catalog.by_id[sid]
+        top_k_snacks.append({
+            "id": sid,
+            "name": snack['name'],
+            "prob": probs[i],
+            "tags": catalog.tags[sid],
+            "catalog_version": catalog.version
+        })
             
     return top_k_snacks
 
@@ -148,7 +327,8 @@ def generate_explanation(user_input, snack):
     """
     reasons = []
     
-    tags = snack.get('tags', [])
+    # Only membership checks below, so prefer the catalog's precomputed tag set
+    tags = get_catalog().tag_sets.get(snack.get('id')) or snack.get('tags', [])
     is_heavy = snack.get('heavy', False)
     name = snack.get('name', '')
     price = snack.get('price', 'medium')
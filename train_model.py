@@ -2,8 +2,14 @@ import pandas as pd
 import numpy as np
 import joblib
 import os
+import io
+import json
+import time
+import argparse
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.naive_bayes import MultinomialNB
 from sklearn.pipeline import Pipeline
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, FunctionTransformer
@@ -38,17 +44,45 @@ class TimeCategoryEncoder(BaseEstimator, TransformerMixin):
         cats = [get_time_category(h) for h in hours]
         return pd.DataFrame(cats, columns=['time_of_day_category'])
 
-def train():
-    print("Loading data...")
+MODEL_PATH = "models/snack_model.joblib"
+# Records which backend produced the saved model so retraining keeps it
+MODEL_INFO_PATH = "models/snack_model.json"
+
+# Backend registry: name -> factory returning an unfitted classifier.
+# Every backend sits behind the same preprocessing Pipeline, so the saved
+# artifact exposes predict_proba/classes_ and works with predict_snack unchanged.
+MODEL_BACKENDS = {
+    "random_forest": lambda: RandomForestClassifier(n_estimators=100, random_state=42),
+    "hist_gradient_boosting": lambda: HistGradientBoostingClassifier(max_iter=100, random_state=42),
+    "logistic_regression": lambda: LogisticRegression(max_iter=1000),
+    "naive_bayes": lambda: MultinomialNB(),
+}
+DEFAULT_BACKEND = "random_forest"
+
+def saved_backend():
+    """Backend of the currently saved model, or DEFAULT_BACKEND if unknown."""
+    try:
+        with open(MODEL_INFO_PATH, "r") as f:
+            backend = json.load(f).get("backend")
+    except Exception:
+        return DEFAULT_BACKEND
+    return backend if backend in MODEL_BACKENDS else DEFAULT_BACKEND
+
+def load_data():
     try:
         df = pd.read_csv("snack_data.csv")
     except FileNotFoundError:
         print("Error: snack_data.csv not found. Run data_generator.py first.")
-        return
+        return None
 
     # Features and Target
     X = df[['hour', 'mood', 'hunger', 'diet', 'context']]
     y = df['snack_id'] # Predicting ID directly
+    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+def build_model(backend=DEFAULT_BACKEND):
+    if backend not in MODEL_BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from: {', '.join(MODEL_BACKENDS)}")
 
     # Preprocessing Pipeline
     # 1. Time category generation (custom transformer)
@@ -94,33 +128,24 @@ def train():
         ('encoder', OneHotEncoder(handle_unknown='ignore')) # Using OneHot for time categories (morning/afternoon/etc) is safer/standard
     ])
     
+    # sparse_threshold=0 keeps the output dense: HistGradientBoosting needs it,
+    # and with ~20 columns dense is also faster for single-row predictions.
     preprocessor = ColumnTransformer(
         transformers=[
             ('time', time_pipe, ['hour']),
             ('cat', OneHotEncoder(handle_unknown='ignore'), ['mood', 'context']),
             ('diet', OneHotEncoder(handle_unknown='ignore'), ['diet']), # OneHot is fine for binary too
             ('num', 'passthrough', ['hunger'])
-        ]
+        ],
+        sparse_threshold=0
     )
     
-    model = Pipeline([
+    return Pipeline([
         ('preprocessor', preprocessor),
-        ('classifier', RandomForestClassifier(n_estimators=100, random_state=42))
+        ('classifier', MODEL_BACKENDS[backend]())
     ])
-    
-    # Split
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    print("Training model...")
-    model.fit(X_train, y_train)
-    
-    # Evaluate
-    print("Evaluating...")
-    y_pred = model.predict(X_test)
-    acc = accuracy_score(y_test, y_pred)
-    print(f"Accuracy: {acc:.4f}")
-    
-    # Top-3 Accuracy
+
+def top3_accuracy(model, X_test, y_test):
     probs = model.predict_proba(X_test)
     # Get class labels
     classes = model.classes_
@@ -132,8 +157,31 @@ def train():
         top3_classes = classes[top3_indices]
         if true_label in top3_classes:
             top3_acc += 1
-    top3_acc /= len(y_test)
-    print(f"Top-3 Accuracy: {top3_acc:.4f}")
+    return top3_acc / len(y_test)
+
+def train(backend=None):
+    # No explicit backend means "retrain whatever is deployed"
+    if backend is None:
+        backend = saved_backend()
+    print("Loading data...")
+    split = load_data()
+    if split is None:
+        return
+    X_train, X_test, y_train, y_test = split
+    
+    model = build_model(backend)
+    
+    print(f"Training model ({backend})...")
+    model.fit(X_train, y_train)
+    
+    # Evaluate
+    print("Evaluating...")
+    y_pred = model.predict(X_test)
+    acc = accuracy_score(y_test, y_pred)
+    print(f"Accuracy: {acc:.4f}")
+    
+    # Top-3 Accuracy
+    print(f"Top-3 Accuracy: {top3_accuracy(model, X_test, y_test):.4f}")
     
     print("\nConfusion Matrix:")
     print(confusion_matrix(y_test, y_pred))
@@ -142,8 +190,77 @@ def train():
     if not os.path.exists("models"):
         os.makedirs("models")
         
-    joblib.dump(model, "models/snack_model.joblib")
-    print("\nModel saved to models/snack_model.joblib")
+    joblib.dump(model, MODEL_PATH)
+    with open(MODEL_INFO_PATH, "w") as f:
+        json.dump({"backend": backend}, f)
+    print(f"\nModel ({backend}) saved to {MODEL_PATH}")
+
+def benchmark(model, X_test, y_test, batch_repeats=20):
+    """
+    Measures a fitted model the way serving uses it: single-row
+    predict_proba calls (as in predict_snack) plus whole-batch throughput.
+    """
+    # Warm up so the first call's overhead doesn't land in the tail
+    model.predict_proba(X_test.iloc[[0]])
+    
+    latencies = []
+    for i in range(len(X_test)):
+        row = X_test.iloc[[i]]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        latencies.append(time.perf_counter() - start)
+    p99_ms = np.percentile(latencies, 99) * 1000
+    
+    start = time.perf_counter()
+    for _ in range(batch_repeats):
+        model.predict_proba(X_test)
+    throughput = batch_repeats * len(X_test) / (time.perf_counter() - start)
+    
+    buf = io.BytesIO()
+    joblib.dump(model, buf)
+    
+    return {
+        "top3_acc": top3_accuracy(model, X_test, y_test),
+        "p99_ms": p99_ms,
+        "throughput": throughput,
+        "size_kb": len(buf.getvalue()) / 1024,
+    }
+
+def compare():
+    """
+    Trains every registered backend on the same split and prints a table
+    of top-3 accuracy, p99 single-row latency, batch throughput and
+    artifact size. Nothing is saved; use --backend to train the winner.
+    """
+    print("Loading data...")
+    split = load_data()
+    if split is None:
+        return
+    X_train, X_test, y_train, y_test = split
+    
+    results = {}
+    for backend in MODEL_BACKENDS:
+        print(f"Training {backend}...")
+        model = build_model(backend)
+        model.fit(X_train, y_train)
+        results[backend] = benchmark(model, X_test, y_test)
+    
+    print(f"\n{'Backend':<24}{'Top-3':>8}{'p99 ms':>10}{'rows/s':>12}{'Size KB':>10}{'Top-3/ms':>10}")
+    for backend, r in sorted(results.items(), key=lambda x: x[1]['top3_acc'] / x[1]['p99_ms'], reverse=True):
+        print(f"{backend:<24}{r['top3_acc']:>8.4f}{r['p99_ms']:>10.3f}{r['throughput']:>12.0f}"
+              f"{r['size_kb']:>10.1f}{r['top3_acc'] / r['p99_ms']:>10.2f}")
+    return results
 
 if __name__ == "__main__":
-    train()
+    parser = argparse.ArgumentParser(description="Train the VibeSnack model.")
+    parser.add_argument("--backend", choices=list(MODEL_BACKENDS), default=None,
+                        help="Classifier to train behind the shared preprocessing pipeline "
+                             "(defaults to the backend of the saved model, else random_forest).")
+    parser.add_argument("--compare", action="store_true",
+                        help="Benchmark every backend on the same split instead of training one.")
+    args = parser.parse_args()
+    
+    if args.compare:
+        compare()
+    else:
+        train(args.backend)